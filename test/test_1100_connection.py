@@ -87,7 +87,7 @@ class TestCase(test_env.BaseTestCase):
         "1103 - test connection end-to-end tracing attributes"
         connection = test_env.get_connection()
         if test_env.get_client_version() >= (12, 1) \
-                and not self.is_on_oracle_cloud(connection):
+                and not test_env.is_on_oracle_cloud():
             sql = "select dbop_name from v$sql_monitor " \
                   "where sid = sys_context('userenv', 'sid')" \
                   "and status = 'EXECUTING'"
@@ -142,7 +142,7 @@ class TestCase(test_env.BaseTestCase):
     def test_1107_change_password(self):
         "1107 - test changing password"
         connection = test_env.get_connection()
-        if self.is_on_oracle_cloud(connection):
+        if test_env.is_on_oracle_cloud():
             self.skipTest("passwords on Oracle Cloud are strictly controlled")
         sys_random = random.SystemRandom()
         new_password = "".join(sys_random.choice(string.ascii_letters) \
@@ -156,7 +156,7 @@ class TestCase(test_env.BaseTestCase):
     def test_1108_change_password_negative(self):
         "1108 - test changing password to an invalid value"
         connection = test_env.get_connection()
-        if self.is_on_oracle_cloud(connection):
+        if test_env.is_on_oracle_cloud():
             self.skipTest("passwords on Oracle Cloud are strictly controlled")
         new_password = "1" * 150
         self.assertRaises(oracledb.DatabaseError, connection.changepassword,
@@ -165,7 +165,7 @@ class TestCase(test_env.BaseTestCase):
     def test_1109_parse_password(self):
         "1109 - test connecting with password containing / and @ symbols"
         connection = test_env.get_connection()
-        if self.is_on_oracle_cloud(connection):
+        if test_env.is_on_oracle_cloud():
             self.skipTest("passwords on Oracle Cloud are strictly controlled")
         sys_random = random.SystemRandom()
         chars = list(sys_random.choice(string.ascii_letters) for i in range(20))
@@ -508,7 +508,7 @@ class TestCase(test_env.BaseTestCase):
     def test_1131_change_password_during_connect(self):
         "1131 - test changing password during connect"
         connection = test_env.get_connection()
-        if self.is_on_oracle_cloud(connection):
+        if test_env.is_on_oracle_cloud():
             self.skipTest("passwords on Oracle Cloud are strictly controlled")
         sys_random = random.SystemRandom()
         new_password = "".join(sys_random.choice(string.ascii_letters) \
@@ -257,7 +257,10 @@ class TestCase(test_env.BaseTestCase):
 
     def test_1918_temporary_lobs(self):
         "1918 - test temporary LOBs"
-        cursor = self.connection.cursor()
+        # a standalone connection is used so that the session is known to
+        # start without any temporary LOBs created by other test cases
+        connection = test_env.get_connection()
+        cursor = connection.cursor()
         cursor.arraysize = self.cursor.arraysize
         cursor.execute("""
                 select sys_context('USERENV', 'SID')
@@ -274,6 +277,7 @@ class TestCase(test_env.BaseTestCase):
         cursor.close()
         temp_lobs = self.__get_temp_lobs(sid)
         self.assertEqual(temp_lobs, 0)
+        connection.close()
 
     def test_1919_assign_string_beyond_array_size(self):
         "1919 - test assign string to NCLOB beyond array size"
@@ -170,7 +170,7 @@ class TestCase(test_env.BaseTestCase):
         "2305 - test getting object type"
         type_obj = self.connection.gettype("UDT_OBJECT")
         self.assertEqual(type_obj.iscollection, False)
-        self.assertEqual(type_obj.schema, self.connection.username.upper())
+        self.assertEqual(type_obj.schema, test_env.get_main_user().upper())
         self.assertEqual(type_obj.name, "UDT_OBJECT")
         sub_object_value_type = self.connection.gettype("UDT_SUBOBJECT")
         sub_object_array_type = self.connection.gettype("UDT_OBJECTARRAY")
@@ -237,7 +237,7 @@ class TestCase(test_env.BaseTestCase):
                 where ObjectCol is not null
                   and rownum <= 1""")
         obj, = self.cursor.fetchone()
-        self.assertEqual(obj.type.schema, self.connection.username.upper())
+        self.assertEqual(obj.type.schema, test_env.get_main_user().upper())
         self.assertEqual(obj.type.name, "UDT_OBJECT")
         self.assertEqual(obj.type.attributes[0].name, "NUMBERVALUE")
 
@@ -333,7 +333,7 @@ class TestCase(test_env.BaseTestCase):
         deq_options = other_connection.deqoptions()
         deq_options.navigation = oracledb.DEQ_FIRST_MSG
         deq_options.visibility = oracledb.DEQ_IMMEDIATE
-        deq_options.transformation = "%s.transform2" % self.connection.username
+        deq_options.transformation = "%s.transform2" % test_env.get_main_user()
         deq_options.wait = oracledb.DEQ_NO_WAIT
         books_type = other_connection.gettype(self.book_type_name)
         book = books_type.newobject()
@@ -350,7 +350,7 @@ class TestCase(test_env.BaseTestCase):
         book.TITLE, book.AUTHORS, book.PRICE = self.book_data[0]
         expectedPrice = book.PRICE + 5
         enq_options = self.connection.enqoptions()
-        enq_options.transformation = "%s.transform1" % self.connection.username
+        enq_options.transformation = "%s.transform1" % test_env.get_main_user()
         props = self.connection.msgproperties()
         self.connection.enq(self.book_queue_name, enq_options, props, book)
         self.connection.commit()
@@ -43,7 +43,7 @@ class TestCase(test_env.BaseTestCase):
 
         # skip if running on the Oracle Cloud, which does not support
         # subscriptions currently
-        if self.is_on_oracle_cloud():
+        if test_env.is_on_oracle_cloud():
             message = "Oracle Cloud does not support subscriptions currently"
             self.skipTest(message)
 
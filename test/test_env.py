@@ -44,8 +44,12 @@
 # user for on premises databases is SYSTEM.
 #------------------------------------------------------------------------------
 
-import getpass
+import atexit
+import functools
+import itertools
+import operator
 import os
+import re
 import sys
 import unittest
 
@@ -56,15 +60,34 @@ DEFAULT_MAIN_USER = "pythontest"
 DEFAULT_PROXY_USER = "pythontestproxy"
 DEFAULT_CONNECT_STRING = "localhost/orclpdb1"
 
+# statements in the SQL scripts run by run_sql_script() are terminated by a
+# line containing only a slash
+STATEMENT_SEPARATOR = re.compile(r"^[ \t]*/[ \t]*$", re.MULTILINE)
+
+# rows from dba_errors are grouped by object name and type when reported by
+# run_sql_script()
+ERROR_KEY = operator.itemgetter(0, 1)
+
+# major and minor components of a database version string like "19.3.0.0.0"
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)")
+
+# tag requested when test cases acquire a session from the shared test pool;
+# sessions are never released with this tag so the requested tag never
+# matches and the pool's session callback, reset_test_session(), is invoked
+# every time a session is handed out to a test case
+TEST_SESSION_TAG = "CX_ORACLE_TEST=RESET"
+
+# alter session statement which restores the NLS settings and time zone of a
+# session that has not yet been used by any test case; this is recorded by
+# reset_test_session() from the first session it is given
+SESSION_STATE_SQL = None
+
 # dictionary containing all parameters; these are acquired as needed by the
 # methods below (which should be used instead of consulting this dictionary
 # directly) and then stored so that a value is not requested more than once
 PARAMETERS = {}
 
-def get_value(name, label, default_value=""):
-    value = PARAMETERS.get(name)
-    if value is not None:
-        return value
+def acquire_value(name, label, default_value):
     env_name = "CX_ORACLE_TEST_" + name
     value = os.environ.get(env_name)
     if value is None:
@@ -74,22 +97,35 @@ def get_value(name, label, default_value=""):
         if default_value:
             value = input(label).strip()
         else:
+            import getpass
             value = getpass.getpass(label)
         if not value:
             value = default_value
     PARAMETERS[name] = value
     return value
 
+def get_value(name, label, default_value=""):
+    value = PARAMETERS.get(name)
+    if value is None:
+        value = acquire_value(name, label, default_value)
+    return value
+
+@functools.lru_cache(maxsize=None)
 def get_admin_connect_string():
     admin_user = get_value("ADMIN_USER", "Administrative user", "admin")
     admin_password = get_value("ADMIN_PASSWORD",
                                "Password for %s" % admin_user)
     return "%s/%s@%s" % (admin_user, admin_password, get_connect_string())
 
+@functools.lru_cache(maxsize=None)
+def get_admin_connection():
+    connection = oracledb.connect(get_admin_connect_string())
+    atexit.register(connection.close)
+    return connection
+
+@functools.lru_cache(maxsize=None)
 def get_charset_ratios():
-    value = PARAMETERS.get("CS_RATIO")
-    if value is None:
-        connection = get_connection()
+    with get_connection() as connection:
         cursor = connection.cursor()
         cursor.execute("""
                 select
@@ -97,29 +133,26 @@ def get_charset_ratios():
                     cast('Y' as nvarchar2(1))
                 from dual""")
         varchar_column_info, nvarchar_column_info = cursor.description
-        value = (varchar_column_info[3], nvarchar_column_info[3])
-        PARAMETERS["CS_RATIO"] = value
-    return value
+    return (varchar_column_info[3], nvarchar_column_info[3])
 
+@functools.lru_cache(maxsize=None)
 def get_client_version():
-    name = "CLIENT_VERSION"
-    value = PARAMETERS.get(name)
-    if value is None:
-        value = oracledb.clientversion()[:2]
-        PARAMETERS[name] = value
-    return value
+    return oracledb.clientversion()[:2]
 
 def get_connection(**kwargs):
     return oracledb.connect(dsn=get_connect_string(), user=get_main_user(),
                             password=get_main_password(), **kwargs)
 
+@functools.lru_cache(maxsize=None)
 def get_connect_string():
     return get_value("CONNECT_STRING", "Connect String",
                      DEFAULT_CONNECT_STRING)
 
+@functools.lru_cache(maxsize=None)
 def get_main_password():
     return get_value("MAIN_PASSWORD", "Password for %s" % get_main_user())
 
+@functools.lru_cache(maxsize=None)
 def get_main_user():
     return get_value("MAIN_USER", "Main User Name", DEFAULT_MAIN_USER)
 
@@ -131,9 +164,11 @@ def get_pool(user=None, password=None, **kwargs):
     return oracledb.SessionPool(user, password, get_connect_string(),
                                 **kwargs)
 
+@functools.lru_cache(maxsize=None)
 def get_proxy_password():
     return get_value("PROXY_PASSWORD", "Password for %s" % get_proxy_user())
 
+@functools.lru_cache(maxsize=None)
 def get_proxy_user():
     return get_value("PROXY_USER", "Proxy User Name", DEFAULT_PROXY_USER)
 
@@ -142,49 +177,94 @@ def get_sleep_proc_name():
     return "dbms_session.sleep" if server_version[0] >= 18 \
             else "dbms_lock.sleep"
 
+@functools.lru_cache(maxsize=None)
 def get_server_version():
-    name = "SERVER_VERSION"
-    value = PARAMETERS.get(name)
-    if value is None:
-        conn = get_connection()
-        value = tuple(int(s) for s in conn.version.split("."))[:2]
-        PARAMETERS[name] = value
-    return value
+    with get_connection() as conn:
+        major, minor = VERSION_PATTERN.match(conn.version).groups()
+    return (int(major), int(minor))
+
+@functools.lru_cache(maxsize=None)
+def get_test_pool():
+    pool = get_pool(min=2, max=8, increment=1, threaded=True,
+                    getmode=oracledb.SPOOL_ATTRVAL_WAIT,
+                    session_callback=reset_test_session)
+    atexit.register(pool.close, force=True)
+    return pool
+
+@functools.lru_cache(maxsize=None)
+def is_on_oracle_cloud():
+    with get_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+                select sys_context('userenv', 'service_name')
+                from dual""")
+        service_name, = cursor.fetchone()
+    return service_name.endswith("oraclecloud.com")
+
+def reset_test_session(connection, requested_tag):
+    # restore the NLS settings and time zone and discard the package state
+    # (including any dbms_output buffer) left behind by the test case that
+    # last used the session; the tag is deliberately not set so that the
+    # callback is invoked again on the next acquire
+    global SESSION_STATE_SQL
+    with connection.cursor() as cursor:
+        if SESSION_STATE_SQL is None:
+            cursor.execute("""
+                    select parameter, value
+                    from nls_session_parameters
+                    where parameter in ('NLS_DATE_FORMAT',
+                            'NLS_NUMERIC_CHARACTERS', 'NLS_TIMESTAMP_FORMAT',
+                            'NLS_TIMESTAMP_TZ_FORMAT')
+                    union all
+                    select 'TIME_ZONE', sessiontimezone
+                    from dual""")
+            SESSION_STATE_SQL = "alter session set " + \
+                    " ".join("%s = '%s'" % (name, value.replace("'", "''"))
+                             for name, value in cursor)
+        cursor.execute("""
+                begin
+                    execute immediate :alter_sql;
+                    dbms_session.modify_package_state(
+                            dbms_session.reinitialize);
+                end;""", alter_sql=SESSION_STATE_SQL)
 
 def run_sql_script(conn, script_name, **kwargs):
-    statement_parts = []
     cursor = conn.cursor()
-    replace_values = [("&" + k + ".", v) for k, v in kwargs.items()] + \
-                     [("&" + k, v) for k, v in kwargs.items()]
     script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
     file_name = os.path.join(script_dir, "sql", script_name + "_exec.sql")
-    for line in open(file_name):
-        if line.strip() == "/":
-            statement = "".join(statement_parts).strip()
-            if statement:
-                for search_value, replace_value in replace_values:
-                    statement = statement.replace(search_value, replace_value)
-                try:
-                    cursor.execute(statement)
-                except:
-                    print("Failed to execute SQL:", statement)
-                    raise
-            statement_parts = []
-        else:
-            statement_parts.append(line)
+    with open(file_name, encoding="utf-8") as f:
+        data = f.read()
+    replace_pattern = None
+    if kwargs:
+        names = sorted(kwargs, key=len, reverse=True)
+        replace_pattern = re.compile(r"&(%s)\.?" %
+                                     "|".join(re.escape(n) for n in names))
+        def replace_value(match):
+            return kwargs[match.group(1)]
+    for statement in STATEMENT_SEPARATOR.split(data)[:-1]:
+        statement = statement.strip()
+        if not statement:
+            continue
+        if replace_pattern is not None:
+            statement = replace_pattern.sub(replace_value, statement)
+        try:
+            cursor.execute(statement)
+        except:
+            print("Failed to execute SQL:", statement)
+            raise
+    cursor.arraysize = 1000
+    cursor.prefetchrows = cursor.arraysize + 1
     cursor.execute("""
             select name, type, line, position, text
             from dba_errors
             where owner = upper(:owner)
             order by name, type, line, position""",
             owner = get_main_user())
-    prev_name = prev_obj_type = None
-    for name, obj_type, line_num, position, text in cursor:
-        if name != prev_name or obj_type != prev_obj_type:
-            print("%s (%s)" % (name, obj_type))
-            prev_name = name
-            prev_obj_type = obj_type
-        print("    %s/%s %s" % (line_num, position, text))
+    rows = cursor.fetchall()
+    for (name, obj_type), errors in itertools.groupby(rows, ERROR_KEY):
+        print(f"{name} ({obj_type})")
+        for _, _, line_num, position, text in errors:
+            print(f"    {line_num}/{position} {text}")
 
 def run_test_cases():
     print("Running tests for cx_Oracle version", oracledb.version,
@@ -194,7 +274,15 @@ def run_test_cases():
             ".".join(str(i) for i in oracledb.clientversion()))
     with get_connection() as connection:
         print("Server Version:", connection.version)
-        print()
+    preload = os.environ.get("LD_PRELOAD", "")
+    if sys.platform.startswith("linux") \
+            and "mimalloc" not in preload and "jemalloc" not in preload:
+        import ctypes.util
+        if ctypes.util.find_library("mimalloc"):
+            print("Tip: mimalloc is installed; running with "
+                  "LD_PRELOAD=libmimalloc.so can reduce memory allocation "
+                  "overhead when fetching")
+    print()
     unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
 
 def skip_client_version_old_multi(min_version1, min_version2):
@@ -203,12 +291,13 @@ def skip_client_version_old_multi(min_version1, min_version2):
             (ver[0] > min_version1[0] and ver[0] < min_version2[0]) or \
             (ver[0] == min_version2[0] and ver[1] < min_version2[1])
 
-def skip_soda_tests():
+@functools.lru_cache(maxsize=None)
+def skip_soda_tests(minclient=(18, 3), minserver=(18, 0)):
     client = get_client_version()
-    if client < (18, 3):
+    if client < minclient:
         return True
     server = get_server_version()
-    if server < (18, 0):
+    if server < minserver:
         return True
     if server > (20, 1) and client < (20, 1):
         return True
@@ -218,7 +307,7 @@ class RoundTripInfo:
 
     def __init__(self, connection):
         self.prev_round_trips = 0
-        self.admin_conn = oracledb.connect(get_admin_connect_string())
+        self.admin_conn = get_admin_connection()
         with connection.cursor() as cursor:
             cursor.execute("select sys_context('userenv', 'sid') from dual")
             self.sid, = cursor.fetchone()
@@ -266,29 +355,20 @@ class BaseTestCase(unittest.TestCase):
     def get_soda_database(self, minclient=(18, 3), minserver=(18, 0),
                           message="not supported with this client/server " \
                                   "combination"):
-        client = get_client_version()
-        if client < minclient:
-            self.skipTest(message)
-        server = get_server_version()
-        if server < minserver:
-            self.skipTest(message)
-        if server > (20, 1) and client < (20, 1):
+        if skip_soda_tests(minclient, minserver):
             self.skipTest(message)
         return self.connection.getSodaDatabase()
 
-    def is_on_oracle_cloud(self, connection=None):
-        if connection is None:
-            connection = self.connection
-        cursor = connection.cursor()
-        cursor.execute("""
-                select sys_context('userenv', 'service_name')
-                from dual""")
-        service_name, = cursor.fetchone()
-        return service_name.endswith("oraclecloud.com")
-
     def setUp(self):
+        # sessions are shared by all test cases through the test pool; the
+        # pool's session callback resets the state of a session before it is
+        # handed out again; note that connections acquired from a pool do not
+        # carry the username or dsn attributes of a standalone connection, so
+        # test cases should use get_main_user() and get_connect_string()
+        # instead
         if self.requires_connection:
-            self.connection = get_connection()
+            pool = get_test_pool()
+            self.connection = pool.acquire(tag=TEST_SESSION_TAG)
             self.cursor = self.connection.cursor()
 
     def setup_round_trip_checker(self):
@@ -296,6 +376,6 @@ class BaseTestCase(unittest.TestCase):
 
     def tearDown(self):
         if self.requires_connection:
-            self.connection.close()
+            self.connection.close()   # returns the session to the pool
             del self.cursor
             del self.connection